@@ -8,95 +8,164 @@ CPU Trace Log Analyzer
 4. cpu_trace.log의 어셈블리와 비교해서 차이점 분석
 """
 
+import bisect
 import re
 import sys
+from collections import namedtuple
 from pathlib import Path
 
+# 줄 단위 루프에서 매번 컴파일하지 않도록 미리 컴파일해 둔 정규식
+_RE_TEST = re.compile(r'^test([0-9a-f]+)\s+([0-9A-Fa-f]+)')
+_RE_TEST_LABEL = re.compile(r'^(test[0-9a-f]+):', re.IGNORECASE)
+_RE_PC = re.compile(r'PC:0x([0-9A-Fa-f]+)\s+\|')
+_RE_DIFF = re.compile(r'\|\s+([0-9A-Fa-f\s]+)\s+\|\s+([A-Za-z0-9\s#(),$]+)')
+
+# 트레이스 로그를 뒤에서부터 읽을 때 사용하는 블록 크기
+_CHUNK_SIZE = 64 * 1024
+
+# 맵 파일 파싱 결과: 주소 -> 테스트 번호 매핑과, 주소 순으로 정렬해 둔 주소/테스트 번호 목록
+MapIndex = namedtuple('MapIndex', ['test_map', 'sorted_addrs', 'sorted_tests'])
+
 def parse_map_file(map_file):
-    """tests-basic.map 파일을 파싱하여 테스트 번호와 주소 매핑 반환"""
+    """tests-basic.map 파일을 파싱하여 테스트 번호와 주소 매핑을 담은 MapIndex 반환"""
     test_map = {}
     with open(map_file, 'r') as f:
         for line in f:
             # test0000                  008294  LF 형식
-            match = re.match(r'^test([0-9a-f]+)\s+([0-9A-Fa-f]+)', line)
+            match = _RE_TEST.match(line)
             if match:
                 test_num = int(match.group(1), 16)
                 addr = int(match.group(2), 16)
                 test_map[addr] = test_num
-    return test_map
+    # 조회할 때마다 정렬하지 않도록 한 번만 정렬해 둠
+    sorted_addrs = sorted(test_map)
+    sorted_tests = [test_map[addr] for addr in sorted_addrs]
+    return MapIndex(test_map, sorted_addrs, sorted_tests)
 
-def find_test_for_pc(test_map, pc):
+def find_test_for_pc(map_index, pc):
     """주어진 PC 주소가 속한 테스트 번호를 찾음"""
-    # PC 주소가 속한 테스트를 찾기 위해 가장 가까운 이전 테스트를 찾음
-    sorted_addrs = sorted(test_map.keys())
-    last_addr = None
-    last_test = None
-    
-    for addr in sorted_addrs:
-        if addr > pc:
-            break
-        last_addr = addr
-        last_test = test_map[addr]
-    
-    if last_addr is None:
-        # PC가 첫 번째 테스트보다 작으면 첫 번째 테스트 반환
-        if sorted_addrs:
-            first_addr = sorted_addrs[0]
-            first_test = test_map[first_addr]
-            next_addr = sorted_addrs[1] if len(sorted_addrs) > 1 else None
-            return first_test, first_addr, next_addr
+    sorted_addrs = map_index.sorted_addrs
+    if not sorted_addrs:
         return None, None, None
     
-    # 다음 테스트의 주소를 찾아 범위 확인
-    idx = sorted_addrs.index(last_addr)
-    if idx + 1 < len(sorted_addrs):
-        next_addr = sorted_addrs[idx + 1]
-        if pc < next_addr:
-            return last_test, last_addr, next_addr
+    # PC 주소보다 작거나 같은 가장 가까운 이전 테스트를 이진 탐색으로 찾음
+    idx = bisect.bisect_right(sorted_addrs, pc) - 1
+    if idx < 0:
+        # PC가 첫 번째 테스트보다 작으면 첫 번째 테스트 반환
+        idx = 0
     
-    return last_test, last_addr, None
+    # 다음 테스트의 주소를 범위의 끝으로 사용
+    addr = sorted_addrs[idx]
+    next_addr = sorted_addrs[idx + 1] if idx + 1 < len(sorted_addrs) else None
+    return map_index.sorted_tests[idx], addr, next_addr
+
+def find_tests_for_pcs(map_index, pcs):
+    """여러 PC 주소 각각이 속한 테스트 번호를 한 번에 찾음"""
+    sorted_addrs, sorted_tests = map_index.sorted_addrs, map_index.sorted_tests
+    if not sorted_addrs:
+        return [None] * len(pcs)
+    
+    bisect_right = bisect.bisect_right
+    # PC가 첫 번째 테스트보다 작으면 find_test_for_pc와 같이 첫 번째 테스트로 봄
+    return [sorted_tests[max(bisect_right(sorted_addrs, pc) - 1, 0)] for pc in pcs]
+
+def read_blocks_reversed(path, chunk_size=_CHUNK_SIZE):
+    """파일 끝에서부터 블록 단위로 거꾸로 읽으며 줄 경계에 맞춘 블록(bytes)을 반환"""
+    with open(path, 'rb') as f:
+        f.seek(0, 2)
+        pos = f.tell()
+        tail = b''
+        while pos > 0:
+            read_size = min(chunk_size, pos)
+            pos -= read_size
+            f.seek(pos)
+            block = f.read(read_size) + tail
+            if pos > 0:
+                # 첫 줄은 이전 블록에 이어질 수 있으므로 다음 읽기까지 보류
+                cut = block.find(b'\n')
+                if cut < 0:
+                    tail = block
+                    continue
+                tail = block[:cut]
+                block = block[cut + 1:]
+            yield block
 
 def parse_trace_log(trace_file):
     """cpu_trace.log 파일을 파싱하여 마지막 실행된 PC 주소 찾기"""
-    last_pc = None
-    last_line = None
-    
-    with open(trace_file, 'r') as f:
-        for line in f:
+    # 마지막 PC만 필요하므로 파일 끝에서부터 거꾸로 읽다가 처음 찾은 곳에서 멈춤
+    for block in read_blocks_reversed(trace_file):
+        end = len(block)
+        while True:
+            # 줄로 나누지 않고 블록 전체에서 'PC:0x'를 바로 찾음
+            hit = block.rfind(b'PC:0x', 0, end)
+            if hit < 0:
+                break
+            line_start = block.rfind(b'\n', 0, hit) + 1
+            line_end = block.find(b'\n', hit)
+            if line_end < 0:
+                line_end = len(block)
+            line = block[line_start:line_end].decode('utf-8', 'replace')
             # [Cyc:0000409878 F:0000] PC:0x0095c5 | 2D FF FF    | AND abs 형식
-            match = re.search(r'PC:0x([0-9A-Fa-f]+)\s+\|', line)
+            match = _RE_PC.search(line)
             if match:
-                last_pc = int(match.group(1), 16)
-                last_line = line.strip()
+                return int(match.group(1), 16), line.strip()
+            end = line_start
     
-    return last_pc, last_line
+    return None, None
 
-def find_test_assembly(inc_file, test_num):
-    """tests-basic.inc에서 특정 테스트 번호의 어셈블리 코드 찾기"""
-    test_name = f'test{test_num:04x}'
-    in_test = False
-    test_lines = []
+def stream_pcs(trace_file, map_index):
+    """cpu_trace.log를 한 번만 훑으며 줄마다 (테스트 번호, PC)를 차례로 반환"""
+    sorted_addrs, sorted_tests = map_index.sorted_addrs, map_index.sorted_tests
+    if not sorted_addrs:
+        return
     
-    with open(inc_file, 'r') as f:
+    # PC 추출과 테스트 조회를 한 루프에서 처리하여 중간 PC 목록을 만들지 않음
+    bisect_right = bisect.bisect_right
+    with open(trace_file, 'r') as f:
         for line in f:
-            if f'{test_name}:' in line or f'{test_name}:' in line.lower():
-                in_test = True
-                test_lines.append(line)
+            if 'PC:0x' not in line:
+                continue
+            match = _RE_PC.search(line)
+            if not match:
+                continue
+            pc = int(match.group(1), 16)
+            yield sorted_tests[max(bisect_right(sorted_addrs, pc) - 1, 0)], pc
+
+class IncIndex:
+    """tests-basic.inc를 한 번만 읽고 테스트 이름별 줄 범위를 색인해 둠"""
+    
+    def __init__(self, inc_file):
+        with open(inc_file, 'r') as f:
+            self.lines = f.readlines()
+        
+        # 테스트 이름 -> (시작 줄, 끝 줄) 범위
+        self.index = {}
+        current = None
+        for i, line in enumerate(self.lines):
+            # 레이블 줄만 정규식으로 확인하도록 앞부분으로 먼저 걸러냄
+            if line[:4].lower() != 'test':
+                continue
+            match = _RE_TEST_LABEL.match(line)
+            if not match:
                 continue
-            
-            if in_test:
-                # 다음 테스트가 시작되면 중단
-                if re.match(r'^test[0-9a-f]+:', line, re.IGNORECASE):
-                    break
-                
-                test_lines.append(line)
-    
-    return test_lines
+            if current is not None:
+                self.index[current[0]] = (current[1], i)
+            current = (match.group(1).lower(), i)
+        if current is not None:
+            self.index[current[0]] = (current[1], len(self.lines))
+    
+    def find_test_assembly(self, test_num):
+        """특정 테스트 번호의 어셈블리 코드 찾기"""
+        span = self.index.get(f'test{test_num:04x}')
+        if span is None:
+            return []
+        start, end = span
+        return self.lines[start:end]
 
 def analyze_assembly_diff(trace_line, expected_asm):
     """트레이스 로그의 어셈블리와 예상 어셈블리를 비교"""
     # 트레이스에서 명령어 추출
-    trace_match = re.search(r'\|\s+([0-9A-Fa-f\s]+)\s+\|\s+([A-Za-z0-9\s#(),$]+)', trace_line)
+    trace_match = _RE_DIFF.search(trace_line)
     if not trace_match:
         return None
     
@@ -131,8 +200,8 @@ def main():
     
     # 맵 파일 파싱
     print("Parsing map file...")
-    test_map = parse_map_file(map_file)
-    print(f"Found {len(test_map)} tests in map file")
+    map_index = parse_map_file(map_file)
+    print(f"Found {len(map_index.test_map)} tests in map file")
     
     # 트레이스 로그 분석
     print("Analyzing trace log...")
@@ -145,7 +214,7 @@ def main():
     print(f"Last line: {last_line}")
     
     # 테스트 번호 찾기
-    test_num, test_start, test_end = find_test_for_pc(test_map, last_pc)
+    test_num, test_start, test_end = find_test_for_pc(map_index, last_pc)
     print(f"\nTest number: test{test_num:04x}")
     print(f"Test start: 0x{test_start:06x}")
     if test_end:
@@ -153,7 +222,8 @@ def main():
     
     # 어셈블리 코드 찾기
     print(f"\nFinding assembly for test{test_num:04x}...")
-    test_asm = find_test_assembly(inc_file, test_num)
+    inc_index = IncIndex(inc_file)
+    test_asm = inc_index.find_test_assembly(test_num)
     
     if test_asm:
         print(f"\nAssembly code (first 30 lines):")
@@ -113,8 +113,7 @@ def create_snes_font():
     # Insert characters into font data
     def insert_char(char_code, pattern):
         offset = char_code * 16
-        for i, byte in enumerate(pattern):
-            font_data[offset + i] = byte
+        font_data[offset:offset + len(pattern)] = bytes(pattern)
     
     insert_char(0x20, char_space)  # Space
     insert_char(0x30, char_0)      # '0'
@@ -127,29 +126,15 @@ def create_snes_font():
     insert_char(0x54, char_T)      # 'T'
     
     # Add more basic characters (simple blocks for others)
-    for c in range(0x34, 0x40):  # '4' to '@'
-        offset = c * 16
-        for i in range(8):
-            font_data[offset + i*2] = 0xFF  # Simple filled pattern
-            font_data[offset + i*2 + 1] = 0x00
-    
-    for c in range(0x42, 0x45):  # 'B', 'C', 'D'
-        offset = c * 16
-        for i in range(8):
-            font_data[offset + i*2] = 0xFF
-            font_data[offset + i*2 + 1] = 0x00
-    
-    for c in range(0x46, 0x53):  # 'F' to 'R'
-        offset = c * 16
-        for i in range(8):
-            font_data[offset + i*2] = 0xFF
-            font_data[offset + i*2 + 1] = 0x00
-    
-    for c in range(0x55, 0x80):  # 'U' to DEL
-        offset = c * 16
-        for i in range(8):
-            font_data[offset + i*2] = 0xFF
-            font_data[offset + i*2 + 1] = 0x00
+    filled = b'\xff\x00' * 8  # Simple filled pattern
+    filled_ranges = [
+        (0x34, 0x40),  # '4' to '@'
+        (0x42, 0x45),  # 'B', 'C', 'D'
+        (0x46, 0x53),  # 'F' to 'R'
+        (0x55, 0x80),  # 'U' to DEL
+    ]
+    for start, end in filled_ranges:
+        font_data[start * 16:end * 16] = filled * (end - start)
     
     return bytes(font_data)
 
@@ -1,9 +1,6 @@
 #!/usr/bin/env python3
-font_data = bytearray(2048)
-
 # Fill with 0xFF for testing
-for i in range(2048):
-    font_data[i] = 0xFF
+font_data = bytearray(b'\xff' * 2048)
 
 with open('font.bin', 'wb') as f:
     f.write(font_data)